@@ -0,0 +1,102 @@
+"""Cold start benchmark for the poker_player modules.
+
+Every measurement spawns a fresh interpreter, so the numbers include everything a short lived worker pays before it
+can deal its first hand. Run from the repository root:
+
+	python benchmarks/startup.py --runs 20 --json startup.json --max-ms 50
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE = ['poker_player.cards', 'poker_player.hands', 'poker_player']
+OPTIONAL = ['poker_player.icm', 'poker_player.stats', 'poker_player.server', 'poker_player.poker']
+HEAVY = ['numpy', 'scipy', 'asyncio']
+REPORT = "import sys; print(','.join(x for x in %r if x in sys.modules))" % HEAVY
+
+
+def _run(statement: str) -> float:
+	"""
+	Times a fresh interpreter running a statement.
+	:param statement: python statement to run.
+	:return: wall time in milliseconds.
+	"""
+	start = time.perf_counter()
+	subprocess.run([sys.executable, '-c', statement], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+	return (time.perf_counter() - start) * 1000
+
+
+def _import_time(module: str) -> float:
+	"""
+	Returns the cumulative import time of a module as reported by -X importtime.
+	:param module: module to import.
+	:return: import time in milliseconds.
+	"""
+	result = subprocess.run(
+		[sys.executable, '-X', 'importtime', '-c', 'import %s' % module], cwd=ROOT, check=True,
+		stderr=subprocess.PIPE, universal_newlines=True)
+	for line in reversed(result.stderr.splitlines()):
+		fields = [x.strip() for x in line.split('|')]
+		if len(fields) == 3 and fields[2] == module:
+			return int(fields[1]) / 1000
+	return float('nan')
+
+
+def measure(modules: List[str], runs: int) -> Dict[str, Dict[str, object]]:
+	"""
+	Measures the cold start cost of each module against an empty interpreter.
+	:param modules: modules to import.
+	:param runs: number of fresh interpreters per module.
+	:return: mapping of modules to their median startup, import time and the heavy modules they load.
+	"""
+	baseline = statistics.median(_run('pass') for _ in range(runs))
+	results = dict()
+	for module in modules:
+		loaded = subprocess.run(
+			[sys.executable, '-c', 'import %s; %s' % (module, REPORT)], cwd=ROOT, check=True,
+			stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+		results[module] = {
+			'startup_ms': statistics.median(_run('import %s' % module) for _ in range(runs)) - baseline,
+			'import_ms': statistics.median(_import_time(module) for _ in range(runs)),
+			'heavy': [x for x in loaded.split(',') if x],
+		}
+	return results
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('modules', nargs='*', default=CORE + OPTIONAL, help='modules to measure')
+	parser.add_argument('--runs', type=int, default=10, help='fresh interpreters per module')
+	parser.add_argument('--json', help='file to write the results to, for tracking across commits')
+	parser.add_argument('--max-ms', type=float, help='fail if a core module takes longer than this to start')
+	args = parser.parse_args()
+
+	results = measure(args.modules, args.runs)
+	print('%-24s %12s %12s  %s' % ('module', 'startup ms', 'import ms', 'heavy modules'))
+	for module, result in results.items():
+		print('%-24s %12.1f %12.1f  %s' % (
+			module, result['startup_ms'], result['import_ms'], ', '.join(result['heavy']) or '-'))
+
+	if args.json:
+		with open(args.json, 'w') as f:
+			json.dump({'python': sys.version.split()[0], 'runs': args.runs, 'results': results}, f, indent=2)
+
+	failed = False
+	for module in (x for x in CORE if x in results):
+		if results[module]['heavy']:
+			print('%s loads %s' % (module, ', '.join(results[module]['heavy'])))
+			failed = True
+		if args.max_ms is not None and results[module]['startup_ms'] > args.max_ms:
+			print('%s takes %.1f ms to start' % (module, results[module]['startup_ms']))
+			failed = True
+	return 1 if failed else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
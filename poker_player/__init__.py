@@ -0,0 +1,25 @@
+import importlib
+
+from .cards import Card, Dealer
+from .error import BetTooLargeError, BetTooSmallError, Error, NotEnoughPlayersError
+from .hands import Evaluator, HandValues
+from .player import Players
+
+# heavy backends are imported on first use so short lived workers that only deal and evaluate cards start quickly.
+_LAZY = {
+	'GameState': '.poker',
+	'TableServer': '.server',
+	'BotClient': '.server',
+}
+
+
+def __getattr__(name):
+	if name in _LAZY:
+		value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+		globals()[name] = value
+		return value
+	raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def __dir__():
+	return sorted(list(globals().keys()) + list(_LAZY.keys()))
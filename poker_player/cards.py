@@ -1,4 +1,3 @@
-from typing import Dict, List
 import random
 
 from .constants import SUITS, VALUES
@@ -54,7 +53,7 @@ class Dealer(object):
         self.counter = 0
         random.shuffle(self.cards)
 
-    def deal_players(self, players: int) -> Dict[int, List[Card]]:
+    def deal_players(self, players: int) -> dict[int, list[Card]]:
         """
         Deals cards to the players. Note that the cards are dealt a card a piece by player (and not two consecutive
         cards to any player).
@@ -64,7 +63,7 @@ class Dealer(object):
         cards_dealt = [next(self) for x in range(players * 2)]
         return {x: [cards_dealt[x], cards_dealt[x + players]] for x in range(players)}
 
-    def deal_common(self, num_cards: int) -> List[Card]:
+    def deal_common(self, num_cards: int) -> list[Card]:
         """
         Deals cards to the common deck. Note that every time a card is dealt this way, the first card is burnt.
         :param num_cards: number of cards to deal.
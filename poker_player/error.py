@@ -6,7 +6,7 @@ class NotEnoughPlayersError (Error):
     """ when too many cards have been drawn
     """
 
-    def __init__(self, message):
+    def __init__(self, message=None):
         self.message = "must have more than one player!"
 
 
@@ -14,7 +14,7 @@ class BetTooSmallError (Error):
     """ too little has been bet
     """
 
-    def __init__(self, message):
+    def __init__(self, message=None):
         self.message = "you must bet at least as much as the prior bet increase!"
 
 
@@ -22,5 +22,29 @@ class BetTooLargeError (Error):
     """ when the bet is larger than holdings
     """
 
-    def __init__(self, message):
+    def __init__(self, message=None):
         self.message = "you have bet more than what you have!"
+
+
+class InvalidPayoutError (Error):
+    """ when the stacks or payouts cannot be used for ICM
+    """
+
+    def __init__(self, message="payouts and stacks must be non-negative and payouts non-empty!"):
+        self.message = message
+
+
+class ProtocolError (Error):
+    """ when a bot sends a malformed or oversized frame
+    """
+
+    def __init__(self, message="bot sent an invalid message!"):
+        self.message = message
+
+
+class TooManyPlayersError (Error):
+    """ when there are not enough cards to deal every player in
+    """
+
+    def __init__(self, message=None):
+        self.message = "a table can seat at most 22 players!"
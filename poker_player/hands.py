@@ -1,5 +1,4 @@
 from enum import Enum
-from typing import Dict, List, Tuple
 from .cards import Card
 from .constants import VALUES
 
@@ -16,7 +15,7 @@ class HandValues(Enum):
 	HIGH_CARD = 0
 
 
-def _count_values(cards: List[Card]) -> Dict[str, List[Card]]:
+def _count_values(cards: list[Card]) -> dict[str, list[Card]]:
 	"""
 	Creates a dictionary of Cards by card_value for a list of cards.
 	:param cards: All valid cards in a List
@@ -26,7 +25,7 @@ def _count_values(cards: List[Card]) -> Dict[str, List[Card]]:
 		x for x in cards if x.card_value == card_value) for card_value in set(x.card_value for x in cards)}
 
 
-def _count_suits(cards: List[Card]) -> Dict[str, List[Card]]:
+def _count_suits(cards: list[Card]) -> dict[str, list[Card]]:
 	"""
 	Creates a dictionary of Cards by suit for a list of cards.
 	:param cards:  All valid cards in a List
@@ -40,7 +39,7 @@ class Evaluator(object):
 		self._card_values = VALUES
 		self._value_ranking = {self._card_values[x]: x for x in range(len(self._card_values))}
 
-	def return_pairs(self, cards: List[Card]) -> List[List[Card]]:
+	def return_pairs(self, cards: list[Card]) -> list[list[Card]]:
 		"""
 		Returns all combinations of pairs.
 		:param cards: All cards in a hand
@@ -51,7 +50,7 @@ class Evaluator(object):
 			[x for x in card_values.keys() if len(card_values[x]) == 2], key=lambda x: self._value_ranking[x])
 		return [card_values[x] for x in pairs]
 
-	def return_trips(self, cards: List[Card]) -> List[List[Card]]:
+	def return_trips(self, cards: list[Card]) -> list[list[Card]]:
 		"""
 		Returns all combinations of trips.
 		:param cards: All cards in a hand
@@ -62,7 +61,7 @@ class Evaluator(object):
 			[x for x in card_values.keys() if len(card_values[x]) == 3], key=lambda x: self._value_ranking[x])
 		return [card_values[x] for x in trips]
 
-	def return_quads(self, cards: List[Card]) -> List[List[Card]]:
+	def return_quads(self, cards: list[Card]) -> list[list[Card]]:
 		"""
 		Returns all combinations of quads.
 		:param cards: All cards in a hand
@@ -73,7 +72,7 @@ class Evaluator(object):
 			[x for x in card_values.keys() if len(card_values[x]) == 4], key=lambda x: self._value_ranking[x])
 		return [card_values[x] for x in quads]
 
-	def return_full_house(self, cards: List[Card]) -> List[Card]:
+	def return_full_house(self, cards: list[Card]) -> list[Card]:
 		"""
 		Returns a list of Cards containing a full house if there is one; an empty list otherwise.
 		:param cards: All cards in a hand
@@ -88,7 +87,7 @@ class Evaluator(object):
 		else:
 			return trips[-1] + pairs[-1]
 
-	def return_straights(self, cards: List[Card]) -> List[Card]:
+	def return_straights(self, cards: list[Card]) -> list[Card]:
 		"""
 		Returns the highest straight given a list of cards.
 		:param cards: All cards in a hand
@@ -106,7 +105,7 @@ class Evaluator(object):
 		else:
 			return list(card_values[x][0] for x in straights[-1])
 
-	def return_flushes(self, cards: List[Card]) -> List[Card]:
+	def return_flushes(self, cards: list[Card]) -> list[Card]:
 		"""
 		Returns all cards that fit a flush given a hand.
 		:param cards: All cards in a hand
@@ -120,7 +119,7 @@ class Evaluator(object):
 		else:
 			return sorted(suits[flushes[0]], key=lambda x: self._value_ranking[x.card_value])
 
-	def return_high_card(self, cards: List[Card], number: int) -> List[Card]:
+	def return_high_card(self, cards: list[Card], number: int) -> list[Card]:
 		"""
 		Returns the highest list of n cards given a hand
 		:param cards: number of cards to return.
@@ -129,7 +128,7 @@ class Evaluator(object):
 		"""
 		return sorted([x for x in cards], key=lambda x: self._value_ranking[x.card_value], reverse=True)[:number]
 
-	def best_hand(self, cards: List[Card]) -> Tuple[List[Card], HandValues]:
+	def best_hand(self, cards: list[Card]) -> tuple[list[Card], HandValues]:
 		"""
 		Returns the best hand given a set of cards.
 		:param cards: List of given cards
@@ -159,6 +158,21 @@ class Evaluator(object):
 		else:
 			return self.return_high_card(cards, 5), HandValues.HIGH_CARD
 
+	def hand_strength(self, cards: list[Card]) -> tuple[int, ...]:
+		"""
+		Returns a key that orders hands by strength; a larger key is a better hand and equal keys split the pot.
+		:param cards: List of given cards
+		:return: a Tuple of the HandValues value followed by the card rankings that break ties.
+		"""
+		hand, hand_type = self.best_hand(cards)
+		if hand_type in (HandValues.STRAIGHT, HandValues.STRAIGHT_FLUSH):
+			# straights are ordered lowest first and only the top card matters.
+			return hand_type.value, self._value_ranking[hand[-1].card_value]
+		elif hand_type == HandValues.FLUSH:
+			return (hand_type.value,) + tuple(sorted((self._value_ranking[x.card_value] for x in hand), reverse=True))
+		else:
+			return (hand_type.value,) + tuple(self._value_ranking[x.card_value] for x in hand)
+
 
 class PlayerEvaluator(Evaluator):
 	def __init__(self):
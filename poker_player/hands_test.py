@@ -171,6 +171,31 @@ class TestHands(unittest.TestCase):
 		self.assertEqual(predicted_best_hand, results)
 		self.assertEqual(hand_type, HandValues.STRAIGHT_FLUSH)
 
+	def test_hand_strength(self):
+		evaluator = Evaluator()
+		board = ['2H', '3D', '4C', '9S', 'KD']
+
+		# a straight beats the same cards without one
+		no_straight = evaluator.hand_strength([_generate_hands(x) for x in board + ['AS', '6C']])
+		six_high = evaluator.hand_strength([_generate_hands(x) for x in board + ['5H', '6H']])
+		self.assertGreater(six_high, no_straight)
+
+		# flushes are compared from the highest card down
+		board = ['2H', '7H', '9H', 'TC', 'KD']
+		ace_flush = evaluator.hand_strength([_generate_hands(x) for x in board + ['AH', '3H']])
+		king_flush = evaluator.hand_strength([_generate_hands(x) for x in board + ['KH', 'QH']])
+		self.assertGreater(ace_flush, king_flush)
+
+		# kickers split or break ties
+		board = ['AH', 'AD', '8C', '7S', '2D']
+		self.assertGreater(
+			evaluator.hand_strength([_generate_hands(x) for x in board + ['KC', '3C']]),
+			evaluator.hand_strength([_generate_hands(x) for x in board + ['QC', 'JC']]))
+		board = ['AH', 'AD', 'KC', 'QS', 'JD']
+		self.assertEqual(
+			evaluator.hand_strength([_generate_hands(x) for x in board + ['3C', '2C']]),
+			evaluator.hand_strength([_generate_hands(x) for x in board + ['4S', '2S']]))
+
 
 if __name__ == '__main__':
 	unittest.main()
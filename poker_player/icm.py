@@ -0,0 +1,290 @@
+import math
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .error import InvalidPayoutError
+
+# one exact step (a subset of finishers times a player still unplaced) and one sampled player cost about the same,
+# roughly 0.5 to 0.8 microseconds each when timed, so the exact calculation is used while it needs no more steps
+# than the sampler would. MAX_EXACT_COST caps the exact path on its own, at around a second.
+MAX_EXACT_COST = 1500000
+DEFAULT_SAMPLES = 20000
+
+
+def _validate(stacks: Sequence[float], payouts: Sequence[float], samples: int = 1) -> None:
+	"""
+	Checks that the stacks, payouts and sample count make sense.
+	:param stacks: chip counts by seat.
+	:param payouts: prize by finishing place, first place first.
+	:param samples: number of finishing orders to draw when sampling.
+	"""
+	if len(payouts) == 0:
+		raise InvalidPayoutError("payout structure is empty")
+	if any(x < 0 for x in stacks):
+		raise InvalidPayoutError("stacks cannot be negative")
+	if any(x < 0 for x in payouts):
+		raise InvalidPayoutError("payouts cannot be negative")
+	if samples < 1:
+		raise InvalidPayoutError("at least one sample is needed")
+
+
+def _paid_places(stacks: Sequence[float], payouts: Sequence[float]) -> Tuple[List[int], List[float]]:
+	"""
+	Returns the seats still alive and the payouts they are playing for. Seats with no chips have already finished and
+	the players left play for the top places only.
+	:param stacks: chip counts by seat.
+	:param payouts: prize by finishing place, first place first.
+	:return: a Tuple of the alive seats and the payouts they can still win.
+	"""
+	alive = [x for x in range(len(stacks)) if stacks[x] > 0]
+	return alive, list(payouts[:len(alive)])
+
+
+def exact_cost(players: int, places: int) -> int:
+	"""
+	Returns the number of steps the exact calculation takes: every subset of finishers it memoizes, times the
+	players that can finish next.
+	:param players: number of players with chips.
+	:param places: number of paid places.
+	:return: number of exact steps.
+	"""
+	return sum(math.comb(players, x) * (players - x) for x in range(min(players, places)))
+
+
+def _use_exact(players: int, places: int, max_exact_cost: Optional[int], samples: int) -> bool:
+	"""
+	Returns whether the exact calculation is cheaper than sampling.
+	:param players: number of players with chips.
+	:param places: number of paid places.
+	:param max_exact_cost: largest number of exact steps allowed, MAX_EXACT_COST if None.
+	:param samples: number of finishing orders the sampler would draw.
+	:return: True to compute exactly.
+	"""
+	limit = MAX_EXACT_COST if max_exact_cost is None else max_exact_cost
+	return exact_cost(players, places) <= min(limit, samples * players)
+
+
+def _exact_equity(stacks: List[float], payouts: List[float]) -> List[float]:
+	"""
+	Malmuth-Harville equity computed over subsets of finishers. Each state is the set of players who took the top
+	places, keyed by bitmask, and holds the probability of that set finishing on top in any order. Only subsets
+	smaller than the number of paid places are ever built, so the cost is bounded by exact_cost and not by n!.
+	:param stacks: chip counts of the alive players.
+	:param payouts: prize by finishing place, no longer than stacks.
+	:return: prize equity by player.
+	"""
+	total = sum(stacks)
+	players = range(len(stacks))
+	equity = [0.0] * len(stacks)
+	level = {0: (1.0, total)}  # mask -> (probability, chips left among unplaced players)
+
+	for place in range(len(payouts)):
+		next_level = dict()  # type: Dict[int, Tuple[float, float]]
+		for mask, (probability, remaining) in level.items():
+			for player in players:
+				if mask >> player & 1:
+					continue
+				chance = probability * stacks[player] / remaining
+				equity[player] += chance * payouts[place]
+
+				if place + 1 < len(payouts):
+					new_mask = mask | (1 << player)
+					previous = next_level.get(new_mask)
+					if previous is None:
+						left = remaining - stacks[player]
+						if left <= 0:
+							# the running subtraction lost the small stacks to rounding.
+							left = math.fsum(stacks[x] for x in players if not new_mask >> x & 1)
+						next_level[new_mask] = (chance, left)
+					else:
+						next_level[new_mask] = (previous[0] + chance, previous[1])
+		level = next_level
+
+	return equity
+
+
+def _batch_exact_equity(np, stacks, payouts: List[float]):
+	"""
+	The exact calculation run once over a whole batch: every subset of finishers is visited a single time and its
+	probability is an array with one entry per stack vector. Seats with no chips never finish in a paid place, as in
+	icm_equity.
+	:param np: the numpy module.
+	:param stacks: array of chip counts, one row per stack vector.
+	:param payouts: prize by finishing place, no longer than a row.
+	:return: array of prize equity, one row per stack vector.
+	"""
+	rows, players = stacks.shape
+	equity = np.zeros((rows, players))
+	level = {0: np.ones(rows)}
+
+	for place in range(len(payouts)):
+		next_level = dict()
+		for mask, probability in level.items():
+			unplaced = [x for x in range(players) if not mask >> x & 1]
+			remaining = stacks[:, unplaced].sum(axis=1)
+			scale = np.divide(probability, remaining, out=np.zeros(rows), where=remaining > 0)
+			for player in unplaced:
+				chance = scale * stacks[:, player]
+				equity[:, player] += chance * payouts[place]
+
+				if place + 1 < len(payouts):
+					new_mask = mask | (1 << player)
+					if new_mask in next_level:
+						next_level[new_mask] += chance
+					else:
+						next_level[new_mask] = chance
+		level = next_level
+
+	return equity
+
+
+def _monte_carlo_equity(
+		stacks: List[float], payouts: List[float], samples: int,
+		rng: random.Random) -> Tuple[List[float], List[float]]:
+	"""
+	Samples finishing orders from the Malmuth-Harville model. Drawing an exponential time with rate equal to each stack
+	and ordering players by time gives exactly the same finishing distribution as picking the winner proportionally
+	to stacks and repeating on the rest.
+	:param stacks: chip counts of the alive players.
+	:param payouts: prize by finishing place, no longer than stacks.
+	:param samples: number of finishing orders to draw.
+	:param rng: random number generator to draw from.
+	:return: a Tuple of prize equity and its standard error by player.
+	"""
+	totals = [0.0] * len(stacks)
+	squares = [0.0] * len(stacks)
+	players = range(len(stacks))
+	places = len(payouts)
+
+	for _ in range(samples):
+		times = sorted((rng.expovariate(stacks[x]), x) for x in players)
+		for place in range(places):
+			player = times[place][1]
+			totals[player] += payouts[place]
+			squares[player] += payouts[place] ** 2
+
+	equity = [x / samples for x in totals]
+	if samples > 1:
+		errors = [
+			math.sqrt(max(0.0, squares[x] / samples - equity[x] ** 2) / (samples - 1)) for x in players]
+	else:
+		errors = [math.inf] * len(stacks)
+	return equity, errors
+
+
+def icm_equity_with_error(
+		stacks: Sequence[float], payouts: Sequence[float], max_exact_cost: Optional[int] = None,
+		samples: int = DEFAULT_SAMPLES, seed: Optional[int] = None) -> Tuple[List[float], List[float]]:
+	"""
+	Returns the ICM prize equity by seat along with its standard error. Fields are computed exactly, with an error of
+	zero, while that is cheaper than sampling; larger fields are approximated by sampling finishing orders.
+	:param stacks: chip counts by seat. Seats with no chips get no further equity.
+	:param payouts: prize by finishing place, first place first.
+	:param max_exact_cost: largest number of exact steps before falling back to sampling, MAX_EXACT_COST if None.
+	:param samples: number of finishing orders to draw when sampling.
+	:param seed: seed for the sampler.
+	:return: a Tuple of prize equity and standard error by seat.
+	"""
+	_validate(stacks, payouts, samples)
+	alive, paid = _paid_places(stacks, payouts)
+	equity = [0.0] * len(stacks)
+	errors = [0.0] * len(stacks)
+
+	if len(alive) == 0:
+		return equity, errors
+
+	alive_stacks = [float(stacks[x]) for x in alive]
+	if _use_exact(len(alive), len(paid), max_exact_cost, samples):
+		alive_equity = _exact_equity(alive_stacks, paid)
+		alive_errors = [0.0] * len(alive)
+	else:
+		alive_equity, alive_errors = _monte_carlo_equity(alive_stacks, paid, samples, random.Random(seed))
+
+	for x in range(len(alive)):
+		equity[alive[x]] = alive_equity[x]
+		errors[alive[x]] = alive_errors[x]
+	return equity, errors
+
+
+def icm_equity(
+		stacks: Sequence[float], payouts: Sequence[float], max_exact_cost: Optional[int] = None,
+		samples: int = DEFAULT_SAMPLES, seed: Optional[int] = None) -> List[float]:
+	"""
+	Returns the ICM prize equity by seat.
+	:param stacks: chip counts by seat. Seats with no chips get no further equity.
+	:param payouts: prize by finishing place, first place first.
+	:param max_exact_cost: largest number of exact steps before falling back to sampling, MAX_EXACT_COST if None.
+	:param samples: number of finishing orders to draw when sampling.
+	:param seed: seed for the sampler.
+	:return: prize equity by seat.
+	"""
+	return icm_equity_with_error(stacks, payouts, max_exact_cost, samples, seed)[0]
+
+
+def batch_icm_equity(
+		stack_vectors: Sequence[Sequence[float]], payouts: Sequence[float], max_exact_cost: Optional[int] = None,
+		samples: int = DEFAULT_SAMPLES, seed: Optional[int] = None) -> List[List[float]]:
+	"""
+	Returns the ICM prize equity for many stack vectors against the same payouts. When numpy is installed, vectors
+	with the same number of seats that are cheap enough to compute exactly share one pass over the subsets of
+	finishers, with every vector handled at once. Without numpy, or for vectors that need sampling, this is a loop
+	over icm_equity that only skips vectors which are permutations of ones already computed.
+	:param stack_vectors: List of chip counts by seat.
+	:param payouts: prize by finishing place, first place first.
+	:param max_exact_cost: largest number of exact steps before falling back to sampling, MAX_EXACT_COST if None.
+	:param samples: number of finishing orders to draw when sampling.
+	:param seed: seed for the sampler.
+	:return: prize equity by seat for every stack vector.
+	"""
+	_validate([], payouts, samples)
+	for stacks in stack_vectors:
+		_validate(stacks, payouts, samples)
+	results = [None] * len(stack_vectors)  # type: List[Optional[List[float]]]
+
+	try:
+		import numpy as np
+	except ImportError:
+		np = None
+
+	if np is not None:
+		by_size = dict()  # type: Dict[int, List[int]]
+		for x in range(len(stack_vectors)):
+			players = len(stack_vectors[x])
+			if players and _use_exact(players, min(players, len(payouts)), max_exact_cost, samples):
+				by_size.setdefault(players, list()).append(x)
+
+		for players, indices in by_size.items():
+			stacks = np.array([stack_vectors[x] for x in indices], dtype=float)
+			equity = _batch_exact_equity(np, stacks, list(payouts[:players]))
+			for row in range(len(indices)):
+				results[indices[row]] = equity[row].tolist()
+
+	computed = dict()  # type: Dict[Tuple[float, ...], List[float]]
+	for x in range(len(stack_vectors)):
+		if results[x] is not None:
+			continue
+		stacks = stack_vectors[x]
+		order = sorted(range(len(stacks)), key=lambda y: stacks[y], reverse=True)
+		key = tuple(stacks[y] for y in order)
+		if key not in computed:
+			computed[key] = icm_equity(key, payouts, max_exact_cost, samples, seed)
+
+		equity = [0.0] * len(stacks)
+		for y in range(len(order)):
+			equity[order[y]] = computed[key][y]
+		results[x] = equity
+
+	return results
+
+
+def game_equity(players: Dict[int, object], payouts: Sequence[float], **kwargs) -> Dict[int, float]:
+	"""
+	Returns the ICM prize equity for the players of a game, such as GameState.players.
+	:param players: mapping of seats to players with holdings and alive attributes.
+	:param payouts: prize by finishing place, first place first.
+	:return: mapping of seats to prize equity.
+	"""
+	seats = sorted(players.keys())
+	stacks = [players[x].holdings if players[x].alive else 0 for x in seats]
+	equity = icm_equity(stacks, payouts, **kwargs)
+	return {seats[x]: equity[x] for x in range(len(seats))}
@@ -0,0 +1,109 @@
+import itertools
+import unittest
+from .error import InvalidPayoutError
+from .icm import batch_icm_equity, exact_cost, game_equity, icm_equity, icm_equity_with_error
+from .player import Players
+
+
+def _factorial_equity(stacks, payouts):
+	"""
+	Reference Malmuth-Harville equity by enumerating every finishing order.
+	:param stacks: chip counts by seat.
+	:param payouts: prize by finishing place.
+	:return: prize equity by seat.
+	"""
+	equity = [0.0] * len(stacks)
+	for order in itertools.permutations(range(len(stacks))):
+		probability, remaining = 1.0, float(sum(stacks))
+		for player in order:
+			probability *= stacks[player] / remaining
+			remaining -= stacks[player]
+		for place in range(min(len(payouts), len(order))):
+			equity[order[place]] += probability * payouts[place]
+	return equity
+
+
+class TestICM(unittest.TestCase):
+	def test_heads_up(self):
+		self.assertEqual(icm_equity([30, 70], [100]), [30.0, 70.0])
+		equity = icm_equity([25, 75], [70, 30])
+		self.assertAlmostEqual(equity[0], 40.0)
+		self.assertAlmostEqual(equity[1], 60.0)
+
+	def test_matches_factorial(self):
+		stacks = [1200, 800, 650, 300, 2500, 40]
+		payouts = [50, 30, 20]
+		for x, y in zip(icm_equity(stacks, payouts), _factorial_equity(stacks, payouts)):
+			self.assertAlmostEqual(x, y)
+		self.assertAlmostEqual(sum(icm_equity(stacks, payouts)), 100.0)
+
+	def test_busted_players(self):
+		equity = icm_equity([0, 50, 50], [60, 30, 10])
+		self.assertEqual(equity[0], 0.0)
+		self.assertAlmostEqual(equity[1], 45.0)
+		self.assertAlmostEqual(equity[2], 45.0)
+
+	def test_monte_carlo(self):
+		stacks = [1200, 800, 650, 300, 2500, 40, 900]
+		payouts = [50, 30, 20]
+		exact = icm_equity(stacks, payouts)
+		approximate, errors = icm_equity_with_error(stacks, payouts, max_exact_cost=0, samples=20000, seed=7)
+		for x in range(len(stacks)):
+			self.assertGreater(errors[x], 0.0)
+			self.assertLess(abs(approximate[x] - exact[x]), 5 * errors[x] + 1e-9)
+
+	def test_large_field(self):
+		stacks = [1000 + 10 * x for x in range(60)]
+		payouts = [30, 20, 15, 10, 8, 7, 5, 5]
+		equity, errors = icm_equity_with_error(stacks, payouts, samples=2000, seed=1)
+		self.assertAlmostEqual(sum(equity), 100.0)
+		self.assertLess(max(errors), 1.0)
+
+	def test_exact_cost(self):
+		# the exact path is only taken while it is no more work than sampling.
+		self.assertEqual(exact_cost(4, 2), 4 + 4 * 3)
+		_, errors = icm_equity_with_error([100 + x for x in range(19)], [1] * 9, samples=100, seed=3)
+		self.assertGreater(min(errors), 0.0)
+		_, errors = icm_equity_with_error([100 + x for x in range(9)], [50, 30, 20])
+		self.assertEqual(max(errors), 0.0)
+
+	def test_batch(self):
+		payouts = [50, 30, 20]
+		vectors = [[10, 20, 30, 40], [40, 30, 20, 10], [5, 5, 5, 5], [0, 10, 0, 30], [7, 1, 2], [0, 0, 0]]
+		results = batch_icm_equity(vectors, payouts)
+		for stacks, equity in zip(vectors, results):
+			for x, y in zip(equity, icm_equity(stacks, payouts)):
+				self.assertAlmostEqual(x, y)
+
+		# vectors that need sampling are computed one by one.
+		vectors = [[100 + x for x in range(12)]]
+		equity = batch_icm_equity(vectors, [1] * 6, max_exact_cost=0, samples=2000, seed=5)[0]
+		self.assertAlmostEqual(sum(equity), 6.0)
+
+	def test_uneven_stacks(self):
+		equity = icm_equity([1e-300, 1], [1, 0.5])
+		self.assertAlmostEqual(equity[0], 0.5)
+		self.assertAlmostEqual(equity[1], 1.0)
+		equity = batch_icm_equity([[1e-300, 1]], [1, 0.5])[0]
+		self.assertAlmostEqual(equity[0], 0.5)
+
+	def test_game_equity(self):
+		players = {x: Players(x * 10) for x in range(3)}
+		players[0].alive = False
+		equity = game_equity(players, [70, 30])
+		self.assertEqual(equity[0], 0.0)
+		self.assertAlmostEqual(equity[1] + equity[2], 100.0)
+
+	def test_invalid(self):
+		with self.assertRaises(InvalidPayoutError):
+			icm_equity([10, 20], [])
+		with self.assertRaises(InvalidPayoutError):
+			icm_equity([10, -20], [10])
+		with self.assertRaises(InvalidPayoutError):
+			icm_equity_with_error([10, 20, 30], [10], max_exact_cost=0, samples=0)
+		with self.assertRaises(InvalidPayoutError):
+			batch_icm_equity([[10, 20]], [10], samples=0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded(statement, modules):
+	"""
+	Runs a statement in a fresh interpreter.
+	:param statement: python statement to run.
+	:param modules: modules to look for afterwards.
+	:return: the modules that were loaded.
+	"""
+	check = "import sys; print(','.join(x for x in %r if x in sys.modules))" % (modules,)
+	output = subprocess.run(
+		[sys.executable, '-c', '%s; %s' % (statement, check)], cwd=ROOT, check=True, stdout=subprocess.PIPE,
+		universal_newlines=True).stdout.strip()
+	return [x for x in output.split(',') if x]
+
+
+class TestImports(unittest.TestCase):
+	def test_core_is_light(self):
+		for module in ['poker_player', 'poker_player.cards', 'poker_player.hands', 'poker_player.player']:
+			self.assertEqual(_loaded('import %s' % module, ['numpy', 'scipy', 'asyncio', 'typing']), list())
+
+	def test_lazy_attributes(self):
+		self.assertEqual(_loaded('import poker_player; poker_player.TableServer', ['asyncio']), ['asyncio'])
+		self.assertEqual(_loaded('import poker_player; poker_player.GameState', ['numpy', 'scipy']), list())
+		with self.assertRaises(subprocess.CalledProcessError):
+			subprocess.run(
+				[sys.executable, '-c', 'import poker_player; poker_player.Missing'], cwd=ROOT, check=True,
+				stderr=subprocess.DEVNULL)
+
+
+if __name__ == '__main__':
+	unittest.main()
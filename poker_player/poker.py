@@ -1,8 +1,5 @@
-import numpy as np
 import random
 
-from scipy.stats import rankdata
-
 from .error import NotEnoughPlayersError
 from .cards import Dealer
 from .hands import Evaluator
@@ -11,8 +8,9 @@ class GameState(object):
 	"""State of individual poker match
 	"""
 
-	def __init__(self, blinds=(1, 2), starting_amount=100, players=2, ante=0):
+	def __init__(self, blinds=(1, 2), starting_amount=100, players=2, ante=0, statistics=None):
 		self.blinds = blinds
+		self.statistics = statistics
 		self.ante = ante
 		self.cards = Dealer()
 		self.dealer_location = random.choice(range(players))
@@ -53,6 +51,7 @@ class GameState(object):
 		self.community_cards = list()
 		self._find_next_dealer()
 		self.current_players = self._play_order()
+		self.starting_holdings = {x: self.players[x].holdings for x in self.current_players}
 
 	def _still_in(self):
 		return sum(list(self.players[x].in_hand for x in self.players.keys()))
@@ -107,14 +106,18 @@ class GameState(object):
 			self.pot[-1] += sum(betting)
 
 	def post_betting(self):
+		# numpy is only needed at showdown, so importing poker does not pay for it up front.
+		import numpy as np
+
 		# getting hands and ranking them
 		still_in = list(player for player in range(len(self.current_players)) if self.players[self.current_players[player]].in_hand)
+		showdown_players = list(still_in)
 		card_results = list(self.evaluator.best_hand(self.community_cards + self.players[self.current_players[player]].cards) for player in range(len(self.current_players)))
 		
 		# changing hands into single value hands
 		# picked 50 since it's larger than any card value or card hand value
 		card_list = {self.cards.card_values[x] : x for x in range(len(self.cards.card_values))}
-		organized_results = np.array(list([x[1]] + list(card_list[y.card_value] for y in x[0]) for x in card_results))
+		organized_results = np.array(list([x[1].value] + list(card_list[y.card_value] for y in x[0]) for x in card_results))
 		single_results = sum(organized_results.T[i] * (50 ** (organized_results.T.shape[0] - i)) for i in range(organized_results.T.shape[0]))
 		
 		# setting up payouts
@@ -155,6 +158,14 @@ class GameState(object):
 		for player in range(len(self.current_players)):
 			self.players[self.current_players[player]].reset(payouts[self.current_players[player]])
 
+		# recording results. GameState cannot play a full hand yet (see StreamingStatistics), so this is not reached.
+		if self.statistics is not None:
+			showdown = list(self.current_players[x] for x in showdown_players) if len(showdown_players) > 1 else list()
+			self.statistics.record(
+				{x: self.players[x].holdings - self.starting_holdings[x] for x in self.current_players},
+				showdown,
+				{self.current_players[x]: card_results[x][1] for x in showdown_players} if len(showdown) else None)
+
 		self._reset_game()
 
 	def preflop(self):
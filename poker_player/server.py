@@ -0,0 +1,562 @@
+import asyncio
+import inspect
+import json
+import struct
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from .cards import Dealer
+from .error import Error, NotEnoughPlayersError, ProtocolError, TooManyPlayersError
+from .hands import Evaluator
+from .player import Players
+
+# every frame is a 4 byte big endian length followed by a compact json payload. a bot opens with
+# {"t": "hello", "name": ...}; tables then send {"t": "act", "id", "tb": table, "st": street, "c": cards, "b": board,
+# "p": pot, "tc": to call, "mr": min raise, "h": holdings} and the bot answers {"t": "action", "id", "a": action,
+# "v": chips to add}. a raise larger than the holdings goes all in and one below the minimum raise is a call.
+HEADER = struct.Struct('!I')
+MAX_FRAME = 1 << 16
+STREETS = (('preflop', 0), ('flop', 3), ('turn', 1), ('river', 1))
+# two hole cards each, five board cards and three burnt cards must fit in one deck.
+MAX_SEATS = (52 - 5 - 3) // 2
+
+Strategy = Callable[[dict], Union[Tuple[str, int], Awaitable[Tuple[str, int]]]]
+
+
+def encode_frame(message: dict) -> bytes:
+	"""
+	Encodes a message into a single frame.
+	:param message: json serializable message.
+	:return: the framed bytes.
+	"""
+	payload = json.dumps(message, separators=(',', ':')).encode()
+	if len(payload) > MAX_FRAME:
+		raise ProtocolError("frame of %i bytes is too large" % len(payload))
+	return HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict:
+	"""
+	Reads a single frame from a stream.
+	:param reader: stream to read from.
+	:return: the decoded message.
+	"""
+	size, = HEADER.unpack(await reader.readexactly(HEADER.size))
+	if size > MAX_FRAME:
+		raise ProtocolError("frame of %i bytes is too large" % size)
+	try:
+		message = json.loads(await reader.readexactly(size))
+	except ValueError:
+		raise ProtocolError("frame is not valid json")
+	if not isinstance(message, dict):
+		raise ProtocolError("frame is not a json object")
+	return message
+
+
+class BotConnection(object):
+	"""A connected bot. Requests from every table using the connection are multiplexed over it by id.
+	"""
+
+	def __init__(self, name: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		self.name = name
+		self.reader = reader
+		self.writer = writer
+		self.tables = 0
+		self.closed = False
+		self._next_id = 0
+		self._pending = dict()  # type: Dict[int, asyncio.Future]
+
+	def __str__(self):
+		return 'connection to %s serving %i tables' % (self.name, self.tables)
+
+	async def request(self, message: dict, timeout: float) -> dict:
+		"""
+		Sends a request and waits for the matching reply.
+		:param message: message to send; an id is added to it.
+		:param timeout: seconds to send the request and receive the reply.
+		:return: the reply.
+		"""
+		if self.closed:
+			raise ConnectionError('connection to %s is closed' % self.name)
+		self._next_id += 1
+		request_id = self._next_id
+		loop = asyncio.get_running_loop()
+		deadline = loop.time() + timeout
+		future = loop.create_future()
+		self._pending[request_id] = future
+
+		try:
+			self.writer.write(encode_frame(dict(message, id=request_id)))
+			# waits for the socket buffer to empty when a bot stops reading; both waits share one deadline.
+			await asyncio.wait_for(self.writer.drain(), timeout)
+			return await asyncio.wait_for(future, max(0.0, deadline - loop.time()))
+		finally:
+			self._pending.pop(request_id, None)
+
+	async def listen(self) -> None:
+		"""
+		Routes replies to the requests waiting on them until the bot disconnects.
+		"""
+		try:
+			while True:
+				message = await read_frame(self.reader)
+				request_id = message.get('id')
+				if not isinstance(request_id, int):
+					continue
+				future = self._pending.get(request_id)
+				# late replies belong to requests that already timed out.
+				if future is not None and not future.done():
+					future.set_result(message)
+		except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+			pass
+		finally:
+			self.close()
+
+	def close(self) -> None:
+		self.closed = True
+		for future in self._pending.values():
+			if not future.done():
+				future.set_exception(ConnectionError('connection to %s is closed' % self.name))
+		self._pending.clear()
+		self.writer.close()
+
+
+class ConnectionPool(object):
+	"""Bot connections by name. A connection serves up to tables_per_connection tables at once, and tables wait for a
+	free connection instead of opening new ones.
+	"""
+
+	def __init__(self, tables_per_connection: int = 64):
+		self.tables_per_connection = tables_per_connection
+		self.connections = dict()  # type: Dict[str, List[BotConnection]]
+		self._condition = asyncio.Condition()
+
+	async def add(self, connection: BotConnection) -> None:
+		async with self._condition:
+			self.connections.setdefault(connection.name, list()).append(connection)
+			self._condition.notify_all()
+
+	async def remove(self, connection: BotConnection) -> None:
+		async with self._condition:
+			if connection in self.connections.get(connection.name, list()):
+				self.connections[connection.name].remove(connection)
+			self._condition.notify_all()
+
+	def _least_loaded(self, names: List[str]) -> Optional[List[BotConnection]]:
+		"""
+		Picks the least loaded connection for every seat, or None if any seat cannot be filled right now.
+		"""
+		load = dict()  # type: Dict[BotConnection, int]
+		chosen = list()
+		for name in names:
+			candidates = [
+				x for x in self.connections.get(name, list())
+				if not x.closed and x.tables + load.get(x, 0) < self.tables_per_connection]
+			if not candidates:
+				return None
+			connection = min(candidates, key=lambda x: x.tables + load.get(x, 0))
+			load[connection] = load.get(connection, 0) + 1
+			chosen.append(connection)
+		return chosen
+
+	def _unavailable(self, names: List[str]) -> bool:
+		"""
+		Returns whether some seat can never be filled by the open connections, because its bot is not connected or
+		takes more seats than all of its connections can serve.
+		"""
+		for name in set(names):
+			connections = [x for x in self.connections.get(name, list()) if not x.closed]
+			if len(connections) * self.tables_per_connection < names.count(name):
+				return True
+		return False
+
+	async def acquire(self, names: List[str], timeout: Optional[float] = None) -> List[BotConnection]:
+		"""
+		Returns the least loaded connection for every seat of a table, waiting until all of them have room. Seats
+		are reserved together so tables never hold some connections while waiting on others. Waiting for busy
+		connections is unbounded; the timeout only runs while a bot is missing.
+		:param names: names the bots connected with, by seat.
+		:param timeout: seconds a bot may be missing before giving up with asyncio.TimeoutError, or None to wait.
+		:return: connections by seat, each reserved for one table.
+		"""
+		loop = asyncio.get_running_loop()
+		deadline = None
+		async with self._condition:
+			connections = self._least_loaded(names)
+			while connections is None:
+				if timeout is None or not self._unavailable(names):
+					deadline = None
+					await self._condition.wait()
+				else:
+					if deadline is None:
+						deadline = loop.time() + timeout
+					if loop.time() >= deadline:
+						raise asyncio.TimeoutError
+					try:
+						await asyncio.wait_for(self._condition.wait(), deadline - loop.time())
+					except asyncio.TimeoutError:
+						pass
+				connections = self._least_loaded(names)
+
+			for connection in connections:
+				connection.tables += 1
+			return connections
+
+	async def release(self, connections: List[BotConnection]) -> None:
+		async with self._condition:
+			for connection in connections:
+				connection.tables -= 1
+			self._condition.notify_all()
+
+
+class Table(object):
+	"""A single match between bots. Hands are played with the Dealer, Players and Evaluator of this package while the
+	actions come from the bot connections.
+	"""
+
+	def __init__(
+			self, table_id: int, connections: List[BotConnection], blinds=(1, 2), starting_amount=100,
+			action_timeout: float = 1.0, statistics=None):
+		self.table_id = table_id
+		self.connections = connections
+		self.blinds = blinds
+		self.action_timeout = action_timeout
+		self.statistics = statistics
+		self.cards = Dealer()
+		self.evaluator = Evaluator()
+		self.players = {x: Players(starting_amount) for x in range(len(connections))}
+		self.dealer_location = 0
+		self.hands = 0
+		self.timeouts = 0
+
+	def __str__(self):
+		return 'table %i with %i remaining players' % (self.table_id, len(self._remaining_players()))
+
+	def _remaining_players(self) -> List[int]:
+		return list(x for x in self.players.keys() if self.players[x].alive)
+
+	def _play_order(self) -> List[int]:
+		seats = self._remaining_players()
+		return [x for x in seats if x > self.dealer_location] + [x for x in seats if x <= self.dealer_location]
+
+	async def _ask(self, seat: int, state: dict) -> Tuple[str, int]:
+		"""
+		Asks the bot in a seat for an action. Bots that time out or disconnect check, or fold if facing a bet.
+		:param seat: seat to act.
+		:param state: what the seat can see.
+		:return: a Tuple of the action and the chips to add.
+		"""
+		try:
+			reply = await self.connections[seat].request(dict(state, t='act'), self.action_timeout)
+			return str(reply.get('a')), int(reply.get('v', 0))
+		except (asyncio.TimeoutError, ConnectionError, ProtocolError, TypeError, ValueError, OverflowError):
+			self.timeouts += 1
+			return 'fold', 0
+
+	async def _betting_round(self, order, street, board, contributions, street_bets, all_in, first) -> None:
+		current = max(street_bets.values())
+		last_raise = self.blinds[1]
+		pending = order[first:] + order[:first]
+
+		while len(pending):
+			seat = pending.pop(0)
+			player = self.players[seat]
+			if not player.in_hand or seat in all_in:
+				continue
+			if sum(self.players[x].in_hand for x in order) <= 1:
+				break
+
+			to_call = current - street_bets[seat]
+			min_raise = to_call + last_raise
+			action, amount = await self._ask(seat, {
+				'tb': self.table_id, 'st': street, 'c': [str(x) for x in player.cards], 'b': [str(x) for x in board],
+				'p': sum(contributions.values()), 'tc': to_call, 'mr': min_raise, 'h': player.holdings})
+
+			if action == 'call':
+				amount = min(to_call, player.holdings)
+			elif action == 'raise':
+				# raises larger than the holdings go all in and raises too small to count are calls.
+				amount = min(amount, player.holdings)
+				if amount < min_raise and amount < player.holdings:
+					amount = min(to_call, player.holdings)
+			else:
+				amount = 0
+
+			try:
+				if action == 'fold' and to_call > 0:
+					player.fold()
+					continue
+				amount, is_all_in = player.bet(amount, to_call, min_raise)
+			except Error:
+				if to_call > 0:
+					player.fold()
+					continue
+				amount, is_all_in = 0, False
+
+			street_bets[seat] += amount
+			contributions[seat] += amount
+			if is_all_in:
+				all_in.add(seat)
+			if street_bets[seat] > current:
+				last_raise = max(last_raise, street_bets[seat] - current)
+				current = street_bets[seat]
+				position = order.index(seat)
+				pending = order[position + 1:] + order[:position]
+
+	def _award(self, order, board, contributions) -> Tuple[Dict[int, int], List[int], dict]:
+		"""
+		Splits the main pot and side pots among the best hands eligible for each.
+		:return: a Tuple of the winnings by seat, the seats at showdown and their HandValues.
+		"""
+		live = [x for x in order if self.players[x].in_hand]
+		winnings = {x: 0 for x in order}
+		if len(live) == 1:
+			winnings[live[0]] = sum(contributions.values())
+			return winnings, list(), dict()
+
+		hands = {x: self.evaluator.best_hand(board + self.players[x].cards) for x in live}
+		strengths = {x: self.evaluator.hand_strength(board + self.players[x].cards) for x in live}
+		previous = 0
+		for level in sorted(set(x for x in contributions.values() if x > 0)):
+			pot = sum(min(x, level) - min(x, previous) for x in contributions.values())
+			eligible = [x for x in live if contributions[x] >= level] or \
+				[x for x in live if contributions[x] == max(contributions[y] for y in live)]
+			best = max(strengths[x] for x in eligible)
+			winners = [x for x in eligible if strengths[x] == best]
+			for winner in winners:
+				winnings[winner] += pot // len(winners)
+			winnings[winners[0]] += pot % len(winners)
+			previous = level
+
+		return winnings, live, {x: hands[x][1] for x in live}
+
+	async def play_hand(self) -> None:
+		order = self._play_order()
+		self.cards.shuffle()
+		starting_holdings = {x: self.players[x].holdings for x in order}
+		dealt_cards = self.cards.deal_players(len(order))
+		contributions = {x: 0 for x in order}
+		all_in = set()
+		board = list()
+
+		for x in range(len(order)):
+			self.players[order[x]].deal_cards(dealt_cards[x])
+
+		# small / big blind
+		street_bets = {x: 0 for x in order}
+		for x in range(2):
+			amount, is_all_in = self.players[order[x]].ante(self.blinds[x])
+			street_bets[order[x]] += amount
+			contributions[order[x]] += amount
+			if is_all_in:
+				all_in.add(order[x])
+
+		for street, num_cards in STREETS:
+			if num_cards:
+				board.extend(self.cards.deal_common(num_cards))
+				street_bets = {x: 0 for x in order}
+			if sum(self.players[x].in_hand for x in order) <= 1:
+				break
+			active = [x for x in order if self.players[x].in_hand and x not in all_in]
+			if len(active) <= 1 and all(street_bets[x] >= max(street_bets.values()) for x in active):
+				continue
+			if street == 'preflop':
+				first = 2 % len(order)
+			else:
+				# heads up the small blind acts first preflop and last afterwards.
+				first = 1 if len(order) == 2 else 0
+			await self._betting_round(order, street, board, contributions, street_bets, all_in, first)
+
+		# the board is run out when everyone is all in before the river.
+		if sum(self.players[x].in_hand for x in order) > 1 and len(board) < 5:
+			board.extend(self.cards.deal_common(5 - len(board)))
+
+		winnings, showdown, hand_values = self._award(order, board, contributions)
+		for seat in order:
+			self.players[seat].reset(winnings[seat])
+		if self.statistics is not None:
+			self.statistics.record(
+				{x: self.players[x].holdings - starting_holdings[x] for x in order}, showdown, hand_values)
+
+		self.hands += 1
+		self.dealer_location = order[0]
+
+	async def play(self, hands: int) -> Dict[int, int]:
+		"""
+		Plays until one player is left or the number of hands is reached.
+		:param hands: largest number of hands to play.
+		:return: mapping of seats to final holdings.
+		"""
+		while self.hands < hands and len(self._remaining_players()) > 1:
+			await self.play_hand()
+		return {x: self.players[x].holdings for x in self.players.keys()}
+
+
+class TableServer(object):
+	"""Hosts many bot matches concurrently over local TCP or Unix sockets.
+	"""
+
+	def __init__(
+			self, max_tables: int = 4096, tables_per_connection: int = 64, action_timeout: float = 1.0,
+			acquire_timeout: float = 30.0, blinds=(1, 2), starting_amount=100, statistics=None):
+		self.max_tables = max_tables
+		self.action_timeout = action_timeout
+		self.acquire_timeout = acquire_timeout
+		self.blinds = blinds
+		self.starting_amount = starting_amount
+		self.statistics = statistics
+		self.pool = ConnectionPool(tables_per_connection)
+		self.active_tables = 0
+		self._tables = asyncio.Semaphore(max_tables)
+		self._next_table = 0
+		self._servers = list()
+		self._handlers = set()
+
+	def __str__(self):
+		return 'server with %i active tables' % self.active_tables
+
+	async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		try:
+			hello = await asyncio.wait_for(read_frame(reader), self.action_timeout)
+		except (asyncio.TimeoutError, asyncio.IncompleteReadError, ProtocolError):
+			writer.close()
+			return
+		if hello.get('t') != 'hello' or not isinstance(hello.get('name'), str):
+			writer.close()
+			return
+
+		connection = BotConnection(hello['name'], reader, writer)
+		self._handlers.add(asyncio.current_task())
+		await self.pool.add(connection)
+		try:
+			await connection.listen()
+		finally:
+			await self.pool.remove(connection)
+			self._handlers.discard(asyncio.current_task())
+
+	async def start_tcp(self, host: str = '127.0.0.1', port: int = 0) -> int:
+		"""
+		Starts listening on a local TCP port.
+		:param host: address to listen on.
+		:param port: port to listen on, 0 picks a free one.
+		:return: the port listened on.
+		"""
+		server = await asyncio.start_server(self._handle_connection, host, port)
+		self._servers.append(server)
+		return server.sockets[0].getsockname()[1]
+
+	async def start_unix(self, path: str) -> None:
+		"""
+		Starts listening on a Unix socket.
+		:param path: path of the socket.
+		"""
+		self._servers.append(await asyncio.start_unix_server(self._handle_connection, path))
+
+	async def play_match(self, bots: List[str], hands: int = 100) -> Dict[int, int]:
+		"""
+		Plays a match between connected bots. Waits while max_tables matches are already running or the bots are
+		busy, and raises asyncio.TimeoutError if a bot stays disconnected for acquire_timeout.
+		:param bots: names of the bots by seat; a bot can take several seats.
+		:param hands: largest number of hands to play.
+		:return: mapping of seats to final holdings.
+		"""
+		if len(bots) < 2:
+			raise NotEnoughPlayersError
+		if len(bots) > MAX_SEATS:
+			raise TooManyPlayersError
+
+		async with self._tables:
+			self._next_table += 1
+			self.active_tables += 1
+			try:
+				connections = await self.pool.acquire(bots, self.acquire_timeout)
+				try:
+					table = Table(
+						self._next_table, connections, self.blinds, self.starting_amount, self.action_timeout,
+						self.statistics)
+					return await table.play(hands)
+				finally:
+					await self.pool.release(connections)
+			finally:
+				self.active_tables -= 1
+
+	async def close(self) -> None:
+		for server in self._servers:
+			server.close()
+			await server.wait_closed()
+		for connections in list(self.pool.connections.values()):
+			for connection in list(connections):
+				connection.close()
+		# closing a connection ends its listener, so the handlers finish instead of being cancelled.
+		await asyncio.gather(*self._handlers, return_exceptions=True)
+
+
+class BotClient(object):
+	"""Connects a strategy to a TableServer. The strategy receives the state sent by a table and returns an action
+	('fold', 'call' or 'raise') and the chips to add; it may be a coroutine function. Raises above the holdings are
+	capped at all in and raises below the minimum are treated as calls; replies that are late or malformed fold.
+	"""
+
+	def __init__(self, name: str, strategy: Strategy):
+		self.name = name
+		self.strategy = strategy
+		self.reader = None
+		self.writer = None
+		self.task = None
+		self._replies = set()
+
+	async def connect_tcp(self, host: str, port: int) -> None:
+		self.reader, self.writer = await asyncio.open_connection(host, port)
+		await self._hello()
+
+	async def connect_unix(self, path: str) -> None:
+		self.reader, self.writer = await asyncio.open_unix_connection(path)
+		await self._hello()
+
+	async def _hello(self) -> None:
+		self.writer.write(encode_frame({'t': 'hello', 'name': self.name}))
+		await self.writer.drain()
+
+	def _send(self, message: dict, action: Tuple[str, int]) -> None:
+		self.writer.write(encode_frame({'t': 'action', 'id': message['id'], 'a': action[0], 'v': action[1]}))
+
+	async def _reply(self, message: dict, action: Awaitable[Tuple[str, int]]) -> None:
+		self._send(message, await action)
+
+	async def run(self) -> None:
+		"""
+		Answers requests until the server disconnects. Coroutine strategies are answered concurrently so a slow table
+		does not hold up the others sharing the connection.
+		"""
+		try:
+			while True:
+				message = await read_frame(self.reader)
+				if message.get('t') != 'act':
+					continue
+				action = self.strategy(message)
+				if inspect.isawaitable(action):
+					reply = asyncio.ensure_future(self._reply(message, action))
+					self._replies.add(reply)
+					reply.add_done_callback(self._replies.discard)
+				else:
+					self._send(message, action)
+					await self.writer.drain()
+		except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+			pass
+		finally:
+			for reply in list(self._replies):
+				reply.cancel()
+			self.writer.close()
+
+	def start(self) -> asyncio.Task:
+		"""
+		Runs the client in the background. The task is kept on the client so it is not garbage collected.
+		:return: the running task.
+		"""
+		self.task = asyncio.ensure_future(self.run())
+		return self.task
+
+	def close(self) -> None:
+		if self.task is not None:
+			self.task.cancel()
+		if self.writer is not None:
+			self.writer.close()
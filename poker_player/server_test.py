@@ -0,0 +1,217 @@
+import asyncio
+import os
+import random
+import tempfile
+import unittest
+from .error import NotEnoughPlayersError, TooManyPlayersError
+from .server import BotClient, TableServer, encode_frame, read_frame
+from .stats import StreamingStatistics
+
+
+def _calling_station(state):
+	return 'call', 0
+
+
+def _random_bot(seed):
+	rng = random.Random(seed)
+
+	def strategy(state):
+		choice = rng.random()
+		if choice < 0.2:
+			return 'fold', 0
+		elif choice < 0.4:
+			return 'raise', max(state['mr'], min(state['h'], state['mr'] * 2))
+		return 'call', 0
+	return strategy
+
+
+def _raiser(state):
+	return 'raise', state['mr']
+
+
+def _overflowing_bot(state):
+	return 'raise', float('inf')
+
+
+def _under_raiser(state):
+	return 'raise', 1
+
+
+def _shover(state):
+	return 'raise', 10 ** 6
+
+
+async def _delayed_station(state):
+	await asyncio.sleep(0.005)
+	return 'call', 0
+
+
+async def _slow_bot(state):
+	await asyncio.sleep(1)
+	return 'raise', state['mr']
+
+
+class TestFrames(unittest.IsolatedAsyncioTestCase):
+	async def test_round_trip(self):
+		reader = asyncio.StreamReader()
+		reader.feed_data(encode_frame({'t': 'act', 'id': 3, 'c': ['AH', '2C']}))
+		self.assertEqual(await read_frame(reader), {'t': 'act', 'id': 3, 'c': ['AH', '2C']})
+
+
+class TestTableServer(unittest.IsolatedAsyncioTestCase):
+	async def asyncSetUp(self):
+		self.statistics = StreamingStatistics()
+		self.server = TableServer(action_timeout=0.2, tables_per_connection=16, statistics=self.statistics)
+		self.port = await self.server.start_tcp()
+		self.bots = list()
+
+	async def asyncTearDown(self):
+		for client in self.bots:
+			client.close()
+		await self.server.close()
+
+	async def _connect(self, name, strategy, connections=1):
+		for _ in range(connections):
+			client = BotClient(name, strategy)
+			await client.connect_tcp('127.0.0.1', self.port)
+			self.bots.append(client)
+			client.start()
+
+	async def test_many_tables(self):
+		await self._connect('station', _calling_station, connections=4)
+		await self._connect('random', _random_bot(5), connections=4)
+		matches = [self.server.play_match(['station', 'random', 'random'], hands=5) for _ in range(100)]
+		results = await asyncio.gather(*matches)
+
+		for result in results:
+			self.assertEqual(sum(result.values()), 300)
+		self.assertGreaterEqual(self.statistics.hands, 100)
+		self.assertEqual(self.server.active_tables, 0)
+		for connections in self.server.pool.connections.values():
+			self.assertTrue(all(x.tables == 0 for x in connections))
+
+	async def test_statistics(self):
+		await self._connect('station', _calling_station, connections=2)
+		await self.server.play_match(['station', 'station', 'station'], hands=4)
+
+		# calling stations always reach showdown, and chips only move between seats.
+		self.assertEqual(self.statistics.hands, 4)
+		self.assertAlmostEqual(sum(self.statistics[x].mean for x in range(3)), 0.0)
+		for seat in range(3):
+			self.assertEqual(self.statistics[seat].showdowns, 4)
+			self.assertEqual(sum(self.statistics[seat].categories.values()), 4)
+
+	async def test_timeouts(self):
+		await self._connect('slow', _slow_bot)
+		await self._connect('raiser', _raiser)
+		result = await self.server.play_match(['slow', 'raiser'], hands=3)
+		# the slow bot times out facing a raise and folds every hand.
+		self.assertEqual(sum(result.values()), 200)
+		self.assertLess(result[0], 100)
+
+	async def test_malformed_reply(self):
+		await self._connect('overflow', _overflowing_bot)
+		await self._connect('raiser', _raiser)
+		result = await self.server.play_match(['overflow', 'raiser'], hands=3)
+		# the reply cannot be read, so the bot folds every hand facing a raise.
+		self.assertEqual(sum(result.values()), 200)
+		self.assertLess(result[0], 100)
+		self.assertEqual(self.statistics[0].showdowns, 0)
+
+	async def test_unhashable_id(self):
+		await self._connect('station', _calling_station)
+		reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+		writer.write(encode_frame({'t': 'hello', 'name': 'station'}))
+		writer.write(encode_frame({'t': 'action', 'id': [], 'a': 'call', 'v': 0}))
+		await writer.drain()
+		await asyncio.sleep(0.05)
+		self.assertEqual(len(self.server.pool.connections['station']), 2)
+		writer.close()
+
+	async def test_raise_sizes(self):
+		await self._connect('under', _under_raiser)
+		await self._connect('station', _calling_station)
+		await self.server.play_match(['under', 'station'], hands=1)
+		# a raise below the minimum is a call and never folds.
+		self.assertEqual(self.statistics[0].showdowns, 1)
+
+		await self._connect('shover', _shover)
+		result = await self.server.play_match(['shover', 'station'], hands=1)
+		# a raise above the holdings goes all in.
+		self.assertIn(sorted(result.values()), [[0, 200], [100, 100]])
+
+	async def test_heads_up_order(self):
+		asked = list()
+
+		def recorder(name):
+			def strategy(state):
+				asked.append((name, state['st']))
+				return 'call', 0
+			return strategy
+		await self._connect('a', recorder('a'))
+		await self._connect('b', recorder('b'))
+		await self.server.play_match(['a', 'b'], hands=1)
+
+		# seat 1 posts the small blind and acts first preflop, then last on every later street.
+		streets = [x for x in asked if x[1] != 'preflop']
+		self.assertEqual(asked[0], ('b', 'preflop'))
+		self.assertEqual(streets[0], ('a', 'flop'))
+		self.assertEqual(streets[-1], ('b', 'river'))
+
+	async def test_seats(self):
+		await self._connect('station', _calling_station, connections=2)
+		with self.assertRaises(NotEnoughPlayersError):
+			await self.server.play_match(['station'])
+		with self.assertRaises(TooManyPlayersError):
+			await self.server.play_match(['station'] * 23)
+		result = await self.server.play_match(['station'] * 22, hands=1)
+		self.assertEqual(sum(result.values()), 2200)
+
+	async def test_missing_bot(self):
+		self.server.acquire_timeout = 0.1
+		with self.assertRaises(asyncio.TimeoutError):
+			await self.server.play_match(['nobody', 'nobody'])
+		self.assertEqual(self.server.active_tables, 0)
+
+	async def test_busy_bots(self):
+		server = TableServer(tables_per_connection=1, acquire_timeout=0.1)
+		port = await server.start_tcp()
+		clients = [BotClient('a', _delayed_station), BotClient('b', _delayed_station)]
+		for client in clients:
+			await client.connect_tcp('127.0.0.1', port)
+			client.start()
+
+		# every match waits on the same two connections for longer than acquire_timeout.
+		started = asyncio.get_running_loop().time()
+		results = await asyncio.gather(*[server.play_match(['a', 'b'], hands=3) for _ in range(4)])
+		self.assertGreater(asyncio.get_running_loop().time() - started, 0.2)
+		for result in results:
+			self.assertEqual(sum(result.values()), 200)
+		for client in clients:
+			client.close()
+		await server.close()
+
+	async def test_max_tables(self):
+		server = TableServer(max_tables=2, action_timeout=0.2)
+		path = os.path.join(tempfile.mkdtemp(), 'tables.sock')
+		await server.start_unix(path)
+		client = BotClient('station', _calling_station)
+		await client.connect_unix(path)
+		client.start()
+
+		peak = list()
+		original = server.pool.acquire
+
+		async def acquire(names, timeout=None):
+			peak.append(server.active_tables)
+			return await original(names, timeout)
+		server.pool.acquire = acquire
+
+		await asyncio.gather(*[server.play_match(['station', 'station'], hands=2) for _ in range(10)])
+		self.assertLessEqual(max(peak), 2)
+		client.close()
+		await server.close()
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,180 @@
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+from .hands import HandValues
+
+# two sided 95% normal quantile
+DEFAULT_Z = 1.959964
+
+
+class SeatStatistics(object):
+	"""Running results for a single seat. Mean and variance are kept with Welford's method so memory does not grow
+	with the number of hands, and two SeatStatistics can be merged exactly.
+	"""
+
+	def __init__(self):
+		self.hands = 0
+		self.mean = 0.0
+		self._m2 = 0.0
+		self.showdowns = 0
+		self.categories = {x: 0 for x in HandValues}
+
+	def update(self, result: float, showdown: bool = False, hand_value: Optional[HandValues] = None) -> None:
+		"""
+		Adds the result of one hand.
+		:param result: chips won (or lost, if negative) during the hand.
+		:param showdown: whether the seat went to showdown.
+		:param hand_value: the HandValues of the seat at showdown, if any.
+		"""
+		self.hands += 1
+		delta = result - self.mean
+		self.mean += delta / self.hands
+		self._m2 += delta * (result - self.mean)
+
+		if showdown:
+			self.showdowns += 1
+		if hand_value is not None:
+			self.categories[hand_value] += 1
+
+	def merge(self, other: 'SeatStatistics') -> None:
+		"""
+		Combines the results of another SeatStatistics into this one.
+		:param other: statistics gathered separately, i.e. in another process.
+		"""
+		if other.hands == 0:
+			return
+		total = self.hands + other.hands
+		delta = other.mean - self.mean
+		self.mean += delta * other.hands / total
+		self._m2 += other._m2 + delta ** 2 * self.hands * other.hands / total
+		self.hands = total
+		self.showdowns += other.showdowns
+		for x in HandValues:
+			self.categories[x] += other.categories[x]
+
+	@property
+	def variance(self) -> float:
+		"""
+		Sample variance of the per hand results.
+		"""
+		return self._m2 / (self.hands - 1) if self.hands > 1 else 0.0
+
+	@property
+	def standard_error(self) -> float:
+		"""
+		Standard error of the mean per hand result.
+		"""
+		return math.sqrt(self.variance / self.hands) if self.hands > 1 else math.inf
+
+	def confidence_interval(self, z: float = DEFAULT_Z) -> Tuple[float, float]:
+		"""
+		Returns the normal confidence interval of the mean per hand result.
+		:param z: normal quantile of the interval.
+		:return: a Tuple of the lower and upper bounds.
+		"""
+		width = z * self.standard_error
+		return self.mean - width, self.mean + width
+
+	def bb_per_100(self, big_blind: float) -> float:
+		"""
+		Returns the win rate in big blinds per 100 hands.
+		:param big_blind: size of the big blind.
+		:return: big blinds won per 100 hands.
+		"""
+		return self.mean * 100 / big_blind
+
+	def bb_per_100_interval(self, big_blind: float, z: float = DEFAULT_Z) -> Tuple[float, float]:
+		"""
+		Returns the confidence interval of the win rate in big blinds per 100 hands.
+		:param big_blind: size of the big blind.
+		:param z: normal quantile of the interval.
+		:return: a Tuple of the lower and upper bounds.
+		"""
+		lower, upper = self.confidence_interval(z)
+		return lower * 100 / big_blind, upper * 100 / big_blind
+
+	@property
+	def showdown_frequency(self) -> float:
+		"""
+		Share of hands that went to showdown.
+		"""
+		return self.showdowns / self.hands if self.hands else 0.0
+
+	def category_distribution(self) -> Dict[HandValues, float]:
+		"""
+		Returns the share of each HandValues among the hands shown down.
+		:return: mapping of HandValues to frequency.
+		"""
+		total = sum(self.categories.values())
+		return {x: (self.categories[x] / total if total else 0.0) for x in HandValues}
+
+
+class StreamingStatistics(object):
+	"""Constant memory aggregator of per seat results over a simulation. Pass one to a TableServer, whose tables
+	record every hand they play, or call record from any other runner; merge aggregators from separate processes once
+	they finish. GameState accepts one too, but cannot play a full hand yet, so the server tables are the supported
+	runner.
+	"""
+
+	def __init__(self, big_blind: float = 2):
+		self.big_blind = big_blind
+		self.hands = 0
+		self.seats = dict()  # type: Dict[int, SeatStatistics]
+
+	def __getitem__(self, seat: int) -> SeatStatistics:
+		if seat not in self.seats:
+			self.seats[seat] = SeatStatistics()
+		return self.seats[seat]
+
+	def __str__(self):
+		return 'statistics over %i hands for %i seats' % (self.hands, len(self.seats))
+
+	def record(
+			self, results: Dict[int, float], showdown: Iterable[int] = (),
+			hand_values: Optional[Dict[int, HandValues]] = None) -> None:
+		"""
+		Adds the results of one hand.
+		:param results: mapping of seats to chips won (or lost) during the hand.
+		:param showdown: seats that went to showdown.
+		:param hand_values: mapping of seats to their HandValues at showdown.
+		"""
+		showdown = set(showdown)
+		hand_values = hand_values or dict()
+		self.hands += 1
+		for seat in results.keys():
+			self[seat].update(results[seat], seat in showdown, hand_values.get(seat))
+
+	def merge(self, other: 'StreamingStatistics') -> 'StreamingStatistics':
+		"""
+		Combines the results of another aggregator into this one.
+		:param other: aggregator gathered separately, i.e. in another process.
+		:return: this aggregator.
+		"""
+		self.hands += other.hands
+		for seat in other.seats.keys():
+			self[seat].merge(other.seats[seat])
+		return self
+
+	def bb_per_100(self) -> Dict[int, float]:
+		"""
+		Returns the win rate of every seat in big blinds per 100 hands.
+		:return: mapping of seats to big blinds won per 100 hands.
+		"""
+		return {x: self.seats[x].bb_per_100(self.big_blind) for x in self.seats.keys()}
+
+	def converged(self, width: float, z: float = DEFAULT_Z, min_hands: int = 100) -> bool:
+		"""
+		Returns whether every seat's bb/100 confidence interval is narrower than the given width, so a simulation can
+		be stopped early.
+		:param width: largest acceptable interval width, in big blinds per 100 hands.
+		:param z: normal quantile of the interval.
+		:param min_hands: number of hands to play before checking.
+		:return: True if the results have converged.
+		"""
+		if self.hands < min_hands or len(self.seats) == 0:
+			return False
+		for seat in self.seats.values():
+			lower, upper = seat.bb_per_100_interval(self.big_blind, z)
+			if upper - lower > width:
+				return False
+		return True
@@ -0,0 +1,57 @@
+import random
+import statistics
+import unittest
+from .hands import HandValues
+from .stats import SeatStatistics, StreamingStatistics
+
+
+class TestStats(unittest.TestCase):
+	def test_seat_moments(self):
+		results = [5, -2, 0, 12.5, -7, 3]
+		seat = SeatStatistics()
+		for result in results:
+			seat.update(result)
+		self.assertEqual(seat.hands, len(results))
+		self.assertAlmostEqual(seat.mean, statistics.mean(results))
+		self.assertAlmostEqual(seat.variance, statistics.variance(results))
+		self.assertAlmostEqual(seat.bb_per_100(2), statistics.mean(results) * 50)
+		lower, upper = seat.confidence_interval()
+		self.assertLess(lower, seat.mean)
+		self.assertGreater(upper, seat.mean)
+
+	def test_merge(self):
+		rng = random.Random(11)
+		results = [rng.uniform(-20, 20) for _ in range(500)]
+		whole, first, second = StreamingStatistics(), StreamingStatistics(), StreamingStatistics()
+		for x in range(len(results)):
+			hand = {0: results[x], 1: -results[x]}
+			whole.record(hand, [0, 1], {0: HandValues.ONE_PAIR, 1: HandValues.FLUSH})
+			(first if x < 123 else second).record(hand, [0, 1], {0: HandValues.ONE_PAIR, 1: HandValues.FLUSH})
+
+		first.merge(second)
+		self.assertEqual(first.hands, whole.hands)
+		for seat in [0, 1]:
+			self.assertEqual(first[seat].hands, whole[seat].hands)
+			self.assertAlmostEqual(first[seat].mean, whole[seat].mean)
+			self.assertAlmostEqual(first[seat].variance, whole[seat].variance)
+			self.assertEqual(first[seat].categories, whole[seat].categories)
+
+	def test_showdowns(self):
+		aggregator = StreamingStatistics()
+		aggregator.record({0: 2, 1: -2})
+		aggregator.record({0: -4, 1: 4}, [0, 1], {0: HandValues.TRIPS, 1: HandValues.STRAIGHT})
+		self.assertEqual(aggregator[0].showdown_frequency, 0.5)
+		self.assertEqual(aggregator[1].category_distribution()[HandValues.STRAIGHT], 1.0)
+		self.assertEqual(aggregator[1].category_distribution()[HandValues.TRIPS], 0.0)
+
+	def test_converged(self):
+		aggregator = StreamingStatistics(big_blind=2)
+		self.assertFalse(aggregator.converged(10))
+		for x in range(1000):
+			aggregator.record({0: 1 if x % 2 else -1})
+		self.assertTrue(aggregator.converged(20))
+		self.assertFalse(aggregator.converged(1))
+
+
+if __name__ == '__main__':
+	unittest.main()